@@ -6,36 +6,119 @@ Usage examples:
     python forex_scanner.py --pairs EUR/USD GBP/USD USD/JPY
     python forex_scanner.py --pairs EUR/USD --output json
     ALPHAVANTAGE_API_KEY=demo python forex_scanner.py
+
+Performance note: the hot path here is network I/O, not computation. Do not
+wrap fetch_exchange_rate, parse_pairs, or render_table with @numba.jit or
+port them to Cython — they operate on strings and dicts, which Numba only
+handles in object mode (slower than plain CPython, see numba#2585) or not at
+all. Speedups come from the asyncio/aiohttp fan-out, HTTP keep-alive, and
+the on-disk TTL cache instead.
 """
 from __future__ import annotations
 
-import argparse
+import asyncio
+import datetime
+import functools
 import json
 import os
+import random
+import re
 import sys
 import time
+import types
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, TextIO, Tuple
+
+# requests and aiohttp are imported lazily: together they pull in urllib3,
+# charset_normalizer, idna, certifi, yarl, multidict, ... — hundreds of
+# milliseconds of cold-start work that --demo and --help never need.
+def _import_requests() -> "types.ModuleType":
+    try:
+        import requests
+    except ImportError as exc:  # pragma: no cover - handled at runtime
+        raise SystemExit(
+            "Missing dependency 'requests'. Install with 'pip install -r requirements.txt'."
+        ) from exc
+    return requests
+
+
+def _import_aiohttp() -> "types.ModuleType":
+    try:
+        import aiohttp
+    except ImportError as exc:  # pragma: no cover - handled at runtime
+        raise SystemExit(
+            "Missing dependency 'aiohttp'. Install with 'pip install -r requirements.txt'."
+        ) from exc
+    return aiohttp
+
 
 try:
-    import requests
-except ImportError as exc:  # pragma: no cover - handled at runtime
-    raise SystemExit(
-        "Missing dependency 'requests'. Install with 'pip install -r requirements.txt'."
-    ) from exc
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
+
+
+def _loads(data: bytes) -> Dict[str, object]:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _write_json(obj: object, stream: "TextIO") -> None:
+    if orjson is not None:
+        stream.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode())
+    else:
+        json.dump(obj, stream, indent=2)
 
 
 ALPHAVANTAGE_API_URL = "https://www.alphavantage.co/query"
 API_FUNCTION = "CURRENCY_EXCHANGE_RATE"
 DEFAULT_PAIRS = ("EUR/USD", "GBP/USD", "USD/JPY", "USD/CHF", "AUD/USD")
 ENV_API_KEY = "ALPHAVANTAGE_API_KEY"
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "forex_scanner")
+DEFAULT_CACHE_TTL = 60.0
+
+# Shared session (built on first use) so repeated fetches reuse the TCP/TLS
+# connection to the API host instead of paying a fresh handshake per request.
+# Retries stay with the callers, which own the per-pair retry/delay policy.
+@functools.lru_cache(maxsize=1)
+def _get_session() -> "requests.Session":
+    requests = _import_requests()
+    session = requests.Session()
+    session.mount(
+        "https://",
+        requests.adapters.HTTPAdapter(
+            pool_connections=4, pool_maxsize=16, max_retries=0
+        ),
+    )
+    return session
 
 
 class ForexScannerError(Exception):
     """Domain-specific exception for scanner errors."""
 
 
-@dataclass
+class ForexRateLimit(ForexScannerError):
+    """Raised when the API rejects a request for rate-limit reasons."""
+
+    def __init__(self, message: str, retry_after: Optional[str] = None) -> None:
+        super().__init__(message)
+        try:
+            self.retry_after = float(retry_after) if retry_after else None
+        except ValueError:
+            self.retry_after = None
+
+
+# Interned payload keys: the lookup in ExchangeRate.from_api then compares by
+# pointer when the parser interns its keys too (orjson does), instead of
+# re-hashing these long strings on every response.
+_K_FROM = sys.intern("1. From_Currency Code")
+_K_TO = sys.intern("3. To_Currency Code")
+_K_RATE = sys.intern("5. Exchange Rate")
+_K_LAST = sys.intern("6. Last Refreshed")
+_K_BID = sys.intern("8. Bid Price")
+_K_ASK = sys.intern("9. Ask Price")
+
+
+@dataclass(frozen=True, slots=True)
 class ExchangeRate:
     from_currency: str
     to_currency: str
@@ -47,12 +130,14 @@ class ExchangeRate:
     @classmethod
     def from_api(cls, payload: Dict[str, str]) -> "ExchangeRate":
         try:
-            from_code = payload["1. From_Currency Code"]
-            to_code = payload["3. To_Currency Code"]
-            rate = float(payload["5. Exchange Rate"])
-            last_refreshed = payload["6. Last Refreshed"]
-            bid_price = cls._parse_optional_float(payload.get("8. Bid Price"))
-            ask_price = cls._parse_optional_float(payload.get("9. Ask Price"))
+            from_code = payload[_K_FROM]
+            to_code = payload[_K_TO]
+            rate = float(payload[_K_RATE])
+            last_refreshed = payload[_K_LAST]
+            bid_raw = payload.get(_K_BID)
+            bid_price = float(bid_raw) if bid_raw else None
+            ask_raw = payload.get(_K_ASK)
+            ask_price = float(ask_raw) if ask_raw else None
         except KeyError as exc:
             raise ForexScannerError(f"Response missing field: {exc}") from exc
         except ValueError as exc:
@@ -66,25 +151,19 @@ class ExchangeRate:
             ask_price=ask_price,
         )
 
-    @staticmethod
-    def _parse_optional_float(value: Optional[str]) -> Optional[float]:
-        if value is None or value == "":
-            return None
-        try:
-            return float(value)
-        except ValueError:
-            return None
+
+_PAIR_TRANS = str.maketrans({"-": "/"})
 
 
 def parse_pairs(pairs: Sequence[str]) -> List[Tuple[str, str]]:
     normalized_pairs = []
     for raw in pairs:
-        cleaned = raw.replace("-", "/").strip().upper()
-        if "/" not in cleaned:
+        cleaned = raw.translate(_PAIR_TRANS).strip().upper()
+        base, sep, quote = cleaned.partition("/")
+        if not sep:
             raise ForexScannerError(
                 f"Invalid pair '{raw}'. Use the format BASE/QUOTE (e.g., EUR/USD)."
             )
-        base, quote = cleaned.split("/", 1)
         if not base or not quote:
             raise ForexScannerError(
                 f"Invalid pair '{raw}'. Both base and quote currencies are required."
@@ -93,30 +172,168 @@ def parse_pairs(pairs: Sequence[str]) -> List[Tuple[str, str]]:
     return normalized_pairs
 
 
+# Fast path for the happy-case response: the rate object is a flat mapping of
+# '"N. Name": "value"' string pairs, so one regex pass over the raw bytes
+# extracts every field without tokenizing the whole document.
+_DATA_KEY_MARKER = b'"Realtime Currency Exchange Rate"'
+_RATE_FIELD_RE = re.compile(rb'"(\d+\. [^"]+)":\s*"([^"]*)"')
+
+
+def _scan_rate_payload(raw: bytes) -> Optional[Dict[str, str]]:
+    if _DATA_KEY_MARKER not in raw:
+        return None
+    fields = {
+        key.decode("utf-8"): value.decode("utf-8")
+        for key, value in _RATE_FIELD_RE.findall(raw)
+    }
+    return fields or None
+
+
+def _parse_rate_response(
+    raw: bytes, base: str, quote: str
+) -> Tuple[ExchangeRate, Dict[str, str]]:
+    fields = _scan_rate_payload(raw)
+    if fields is not None:
+        try:
+            return ExchangeRate.from_api(fields), fields
+        except ForexScannerError:
+            pass  # fall through to the full parse for accurate diagnostics
+    payload = _loads(raw)
+    rate = _translate_payload(payload, base, quote)
+    return rate, payload["Realtime Currency Exchange Rate"]
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_api_key(explicit: Optional[str]) -> Optional[str]:
+    return explicit or os.getenv(ENV_API_KEY)
+
+
+@functools.lru_cache(maxsize=4)
+def _base_params(api_key: str) -> Dict[str, str]:
+    return {"function": API_FUNCTION, "apikey": api_key}
+
+
+def _cache_path(base: str, quote: str) -> str:
+    return os.path.join(CACHE_DIR, f"{base}_{quote}.json")
+
+
+def _cache_get(base: str, quote: str, ttl: float) -> Optional[ExchangeRate]:
+    if ttl <= 0:
+        return None
+    try:
+        with open(_cache_path(base, quote), "r", encoding="utf-8") as file:
+            entry = json.load(file)
+        if time.time() - entry["fetched_at"] < ttl:
+            return ExchangeRate.from_api(entry["payload"])
+    except (OSError, ValueError, KeyError, TypeError, ForexScannerError):
+        pass  # unreadable or corrupt entries count as misses
+    return None
+
+
+def _cache_put(base: str, quote: str, payload: Dict[str, str]) -> None:
+    path = _cache_path(base, quote)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump({"fetched_at": time.time(), "payload": payload}, file)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # caching is best-effort; never fail the fetch over it
+
+
 def fetch_exchange_rate(
-    api_key: str, base: str, quote: str, *, timeout: int = 10
+    api_key: str,
+    base: str,
+    quote: str,
+    *,
+    timeout: int = 10,
+    session: Optional["requests.Session"] = None,
+    cache_ttl: float = 0.0,
 ) -> ExchangeRate:
-    params = {
-        "function": API_FUNCTION,
-        "from_currency": base,
-        "to_currency": quote,
-        "apikey": api_key,
-    }
+    cached = _cache_get(base, quote, cache_ttl)
+    if cached is not None:
+        return cached
+    requests = _import_requests()
+    params = {**_base_params(api_key), "from_currency": base, "to_currency": quote}
     try:
-        response = requests.get(ALPHAVANTAGE_API_URL, params=params, timeout=timeout)
+        response = (session or _get_session()).get(
+            ALPHAVANTAGE_API_URL, params=params, timeout=timeout
+        )
         response.raise_for_status()
     except requests.RequestException as exc:
+        failed = getattr(exc, "response", None)
+        if failed is not None and failed.status_code == 429:
+            raise ForexRateLimit(
+                f"Rate limited while fetching {base}/{quote}.",
+                retry_after=failed.headers.get("Retry-After"),
+            ) from exc
+        raise ForexScannerError(
+            f"Network error while fetching {base}/{quote}: {exc}"
+        ) from exc
+
+    rate, fields = _parse_rate_response(response.content, base, quote)
+    if cache_ttl > 0:
+        _cache_put(base, quote, fields)
+    return rate
+
+
+async def fetch_exchange_rate_async(
+    session: "aiohttp.ClientSession",
+    api_key: str,
+    base: str,
+    quote: str,
+    *,
+    timeout: int = 10,
+    cache_ttl: float = 0.0,
+) -> ExchangeRate:
+    cached = _cache_get(base, quote, cache_ttl)
+    if cached is not None:
+        return cached
+    aiohttp = _import_aiohttp()
+    params = {**_base_params(api_key), "from_currency": base, "to_currency": quote}
+    try:
+        async with session.get(
+            ALPHAVANTAGE_API_URL,
+            params=params,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as response:
+            response.raise_for_status()
+            raw = await response.read()
+    except aiohttp.ClientResponseError as exc:
+        if exc.status == 429:
+            retry_after = exc.headers.get("Retry-After") if exc.headers else None
+            raise ForexRateLimit(
+                f"Rate limited while fetching {base}/{quote}.",
+                retry_after=retry_after,
+            ) from exc
         raise ForexScannerError(
             f"Network error while fetching {base}/{quote}: {exc}"
         ) from exc
+    except aiohttp.ClientError as exc:
+        raise ForexScannerError(
+            f"Network error while fetching {base}/{quote}: {exc}"
+        ) from exc
+    except asyncio.TimeoutError as exc:
+        raise ForexScannerError(
+            f"Timeout while fetching {base}/{quote}."
+        ) from exc
 
-    payload = response.json()
+    rate, fields = _parse_rate_response(raw, base, quote)
+    if cache_ttl > 0:
+        _cache_put(base, quote, fields)
+    return rate
+
+
+def _translate_payload(
+    payload: Dict[str, object], base: str, quote: str
+) -> ExchangeRate:
     if "Error Message" in payload:
         raise ForexScannerError(
             f"API error for {base}/{quote}: {payload['Error Message']}"
         )
     if "Note" in payload:
-        raise ForexScannerError(
+        raise ForexRateLimit(
             f"API limit reached: {payload['Note']} (pair {base}/{quote})."
         )
     data_key = "Realtime Currency Exchange Rate"
@@ -133,6 +350,7 @@ def run_scanner(
     *,
     retry: int,
     retry_delay: float,
+    cache_ttl: float = 0.0,
 ) -> List[ExchangeRate]:
     if not api_key:
         raise ForexScannerError(
@@ -140,48 +358,123 @@ def run_scanner(
             "provide --api-key."
         )
 
-    results: List[ExchangeRate] = []
-    for base, quote in pairs:
+    async def _with_retry(
+        session: "aiohttp.ClientSession", base: str, quote: str
+    ) -> ExchangeRate:
         attempt = 0
         while True:
             try:
-                rate = fetch_exchange_rate(api_key, base, quote)
-                results.append(rate)
-                break
+                return await fetch_exchange_rate_async(
+                    session, api_key, base, quote, cache_ttl=cache_ttl
+                )
             except ForexScannerError as exc:
                 attempt += 1
                 if attempt > retry:
                     raise
-                time.sleep(retry_delay)
-    return results
+                # Honor the server's Retry-After when given; otherwise back
+                # off exponentially with jitter so retries spread out instead
+                # of hammering the limit in lockstep.
+                if isinstance(exc, ForexRateLimit) and exc.retry_after is not None:
+                    delay = exc.retry_after
+                else:
+                    delay = retry_delay * (2 ** (attempt - 1)) + random.uniform(0, 0.25)
+                await asyncio.sleep(delay)
 
+    try:
+        import aiohttp
+    except ImportError:
+        # Thread-based fallback: requests.get releases the GIL during socket
+        # I/O, so the per-pair round-trips still overlap without aiohttp.
+        return _run_scanner_threads(
+            pairs, api_key, retry=retry, retry_delay=retry_delay, cache_ttl=cache_ttl
+        )
 
-def render_table(data: Iterable[ExchangeRate]) -> str:
-    headers = (
-        ("Pair", max(4, max((len(f"{item.from_currency}/{item.to_currency}") for item in data), default=4))),
-        ("Rate", 12),
-        ("Bid", 12),
-        ("Ask", 12),
-        ("Last Refreshed", 19),
-    )
-    column_widths = {name: width for name, width in headers}
-    header_line = " | ".join(f"{name:<{column_widths[name]}}" for name, _ in headers)
-    separator = "-+-".join("-" * column_widths[name] for name, _ in headers)
-
-    rows = []
-    for item in data:
-        pair = f"{item.from_currency}/{item.to_currency}"
-        rows.append(
-            " | ".join(
-                (
-                    f"{pair:<{column_widths['Pair']}}",
-                    f"{item.rate:<{column_widths['Rate']}.6f}",
-                    f"{format_price(item.bid_price, column_widths['Bid'])}",
-                    f"{format_price(item.ask_price, column_widths['Ask'])}",
-                    f"{item.last_refreshed:<{column_widths['Last Refreshed']}}",
-                )
+    async def _run() -> List[ExchangeRate]:
+        # Fan duplicate pairs into one request each — the API has no bulk
+        # endpoint, so deduplication is the only batching available, and every
+        # request saved is a free-tier quota slot kept. The bounded connector
+        # multiplexes the gather over a few warm connections to the one host.
+        unique_pairs = list(dict.fromkeys(pairs))
+        connector = aiohttp.TCPConnector(limit=8, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            fetched = await asyncio.gather(
+                *(_with_retry(session, base, quote) for base, quote in unique_pairs)
             )
+        by_pair = dict(zip(unique_pairs, fetched))
+        return [by_pair[pair] for pair in pairs]
+
+    return asyncio.run(_run())
+
+
+def _run_scanner_threads(
+    pairs: Sequence[Tuple[str, str]],
+    api_key: str,
+    *,
+    retry: int,
+    retry_delay: float,
+    cache_ttl: float,
+) -> List[ExchangeRate]:
+    from concurrent.futures import ThreadPoolExecutor
+
+    def _fetch_with_retry(base: str, quote: str) -> ExchangeRate:
+        attempt = 0
+        while True:
+            try:
+                return fetch_exchange_rate(api_key, base, quote, cache_ttl=cache_ttl)
+            except ForexScannerError as exc:
+                attempt += 1
+                if attempt > retry:
+                    raise
+                if isinstance(exc, ForexRateLimit) and exc.retry_after is not None:
+                    delay = exc.retry_after
+                else:
+                    delay = retry_delay * (2 ** (attempt - 1)) + random.uniform(0, 0.25)
+                time.sleep(delay)
+
+    unique_pairs = list(dict.fromkeys(pairs))
+    if not unique_pairs:
+        return []
+    with ThreadPoolExecutor(max_workers=min(len(unique_pairs), 8)) as executor:
+        futures = [
+            executor.submit(_fetch_with_retry, base, quote)
+            for base, quote in unique_pairs
+        ]
+        fetched = [future.result() for future in futures]
+    by_pair = dict(zip(unique_pairs, fetched))
+    return [by_pair[pair] for pair in pairs]
+
+
+_STATIC_WIDTHS = {"Rate": 12, "Bid": 12, "Ask": 12, "Last Refreshed": 19}
+
+
+@functools.lru_cache(maxsize=8)
+def _table_layout(pair_width: int) -> Tuple[str, str, str]:
+    """Header line, separator, and row format for a given Pair column width."""
+    widths = {"Pair": pair_width, **_STATIC_WIDTHS}
+    header_line = " | ".join(f"{name:<{width}}" for name, width in widths.items())
+    separator = "-+-".join("-" * width for width in widths.values())
+    row_fmt = (
+        f"{{:<{pair_width}}} | {{:<{_STATIC_WIDTHS['Rate']}.6f}} | "
+        f"{{}} | {{}} | {{:<{_STATIC_WIDTHS['Last Refreshed']}}}"
+    )
+    return header_line, separator, row_fmt
+
+
+def render_table(data: Iterable[ExchangeRate]) -> str:
+    data = list(data)
+    pair_labels = [f"{item.from_currency}/{item.to_currency}" for item in data]
+    pair_width = max(4, max(map(len, pair_labels), default=4))
+    header_line, separator, row_fmt = _table_layout(pair_width)
+    rows = [
+        row_fmt.format(
+            pair,
+            item.rate,
+            format_price(item.bid_price, _STATIC_WIDTHS["Bid"]),
+            format_price(item.ask_price, _STATIC_WIDTHS["Ask"]),
+            item.last_refreshed,
         )
+        for pair, item in zip(pair_labels, data)
+    ]
     return "\n".join((header_line, separator, *rows))
 
 
@@ -191,11 +484,13 @@ def format_price(value: Optional[float], width: int) -> str:
 
 def save_output(path: str, payload: Dict[str, object]) -> None:
     with open(path, "w", encoding="utf-8") as file:
-        json.dump(payload, file, indent=2)
+        _write_json(payload, file)
 
 
-def load_demo_data(pairs: Sequence[Tuple[str, str]]) -> List[ExchangeRate]:
-    demo_payload: Dict[str, Dict[str, str]] = {
+# Built once at import; MappingProxyType keeps callers from mutating the
+# shared demo fixtures.
+_DEMO_PAYLOAD: "types.MappingProxyType[str, Dict[str, str]]" = types.MappingProxyType(
+    {
         "EUR/USD": {
             "1. From_Currency Code": "EUR",
             "3. To_Currency Code": "USD",
@@ -237,18 +532,24 @@ def load_demo_data(pairs: Sequence[Tuple[str, str]]) -> List[ExchangeRate]:
             "9. Ask Price": "0.65340",
         },
     }
+)
+
+
+def load_demo_data(pairs: Sequence[Tuple[str, str]]) -> List[ExchangeRate]:
     results = []
     for base, quote in pairs:
         key = f"{base}/{quote}"
-        if key not in demo_payload:
+        if key not in _DEMO_PAYLOAD:
             raise ForexScannerError(
                 f"Demo data for {key} is unavailable. Try a default currency pair."
             )
-        results.append(ExchangeRate.from_api(demo_payload[key]))
+        results.append(ExchangeRate.from_api(_DEMO_PAYLOAD[key]))
     return results
 
 
-def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> "argparse.Namespace":
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Fetch live forex exchange rates using the Alpha Vantage API.",
         epilog="Alpha Vantage free tier allows 25 requests/day and 5 requests/minute.",
@@ -289,6 +590,16 @@ def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
         default=5.0,
         help="Seconds to wait between retries (default: 5).",
     )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=DEFAULT_CACHE_TTL,
+        metavar="SECONDS",
+        help=(
+            "Serve cached rates younger than this many seconds instead of "
+            "calling the API; 0 disables caching (default: %(default)s)."
+        ),
+    )
     parser.add_argument(
         "--demo",
         action="store_true",
@@ -304,12 +615,13 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         if args.demo:
             rates = load_demo_data(pairs)
         else:
-            api_key = args.api_key or os.getenv(ENV_API_KEY)
+            api_key = _resolve_api_key(args.api_key)
             rates = run_scanner(
                 pairs,
                 api_key,
                 retry=max(0, args.retry),
                 retry_delay=max(0.5, args.retry_delay),
+                cache_ttl=max(0.0, args.cache_ttl),
             )
         if args.output == "json":
             payload = [
@@ -322,12 +634,15 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
                 }
                 for rate in rates
             ]
-            print(json.dumps(payload, indent=2))
+            _write_json(payload, sys.stdout)
+            sys.stdout.write("\n")
         else:
             print(render_table(rates))
         if args.save:
             payload = {
-                "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "generated_at": datetime.datetime.now(datetime.timezone.utc)
+                .isoformat(timespec="seconds")
+                .replace("+00:00", "Z"),
                 "pairs": [f"{base}/{quote}" for base, quote in pairs],
                 "data": [
                     {